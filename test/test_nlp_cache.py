@@ -0,0 +1,137 @@
+import os
+import sys
+import types
+import logging
+import subprocess
+import multiprocessing
+import pytest
+from utils import nlp_cache
+from utils.nlp_cache import build_namespace, close_cache, get_or_compute, open_cache
+
+NAMESPACE = "mispell|phunspell==0.1.6|en_GB,fr_FR"
+
+def fail(text: str) -> None:
+    raise AssertionError(f"{text} should have been read from the cache")
+
+def upper(text: str) -> str:
+    return text.upper()
+
+def write_results(path: str, worker: int) -> None:
+    open_cache(path, 50)
+    for index in range(300):
+        get_or_compute(NAMESPACE, f"shared {index}", upper)
+        get_or_compute(NAMESPACE, f"worker {worker} {index}", upper)
+    close_cache()
+
+@pytest.fixture
+def cache_path(tmp_path):
+    yield str(tmp_path / "cache" / "nlp_cache.sqlite")
+    close_cache()
+
+def test_hit_after_reopening(cache_path):
+    open_cache(cache_path, 50)
+    assert get_or_compute(NAMESPACE, "Accès au WiFi", upper) == "ACCÈS AU WIFI"
+    close_cache()
+
+    open_cache(cache_path, 50)
+    assert get_or_compute(NAMESPACE, "Accès au WiFi", fail) == "ACCÈS AU WIFI"
+    assert nlp_cache.CACHE["hits"] == 1
+
+def test_none_is_cached(cache_path):
+    open_cache(cache_path, 50)
+    assert get_or_compute(NAMESPACE, "1234", lambda text: None) is None
+    close_cache()
+
+    open_cache(cache_path, 50)
+    assert get_or_compute(NAMESPACE, "1234", fail) is None
+
+def test_namespace_separates_versions_and_settings(cache_path, monkeypatch):
+    monkeypatch.setattr(nlp_cache, "version", lambda package: "2.0.2")
+    english_french = build_namespace("language", "lingua-language-detector", None, ["ENGLISH", "FRENCH"])
+    french_english = build_namespace("language", "lingua-language-detector", None, ["FRENCH", "ENGLISH"])
+    english_german = build_namespace("language", "lingua-language-detector", None, ["ENGLISH", "GERMAN"])
+    monkeypatch.setattr(nlp_cache, "version", lambda package: "2.1.0")
+    upgraded = build_namespace("language", "lingua-language-detector", None, ["ENGLISH", "FRENCH"])
+
+    assert english_french == french_english
+    assert len({english_french, english_german, upgraded}) == 3
+
+    open_cache(cache_path, 50)
+    get_or_compute(english_french, "AdTech", lambda text: "ENGLISH")
+    assert get_or_compute(english_german, "AdTech", lambda text: "GERMAN") == "GERMAN"
+    assert get_or_compute(upgraded, "AdTech", lambda text: "FRENCH") == "FRENCH"
+    assert get_or_compute(english_french, "AdTech", fail) == "ENGLISH"
+
+def test_namespace_without_version(cache_path, monkeypatch):
+    def not_found(package):
+        raise nlp_cache.PackageNotFoundError(package)
+
+    monkeypatch.setattr(nlp_cache, "version", not_found)
+    monkeypatch.setattr(nlp_cache, "UNKNOWN_VERSIONS", [])
+    assert build_namespace("mispell", "phunspell", types.SimpleNamespace(__version__="0.1.6"), ["fr_FR"]) == "mispell|phunspell==0.1.6|fr_FR"
+    namespace = build_namespace("mispell", "phunspell", types.SimpleNamespace(), ["fr_FR"])
+    assert namespace is None
+
+    open_cache(cache_path, 50)
+    get_or_compute(namespace, "Vivatech", upper)
+    assert get_or_compute(namespace, "Vivatech", lambda text: "computed") == "computed"
+
+def test_namespace_without_version_does_not_configure_logging(cache_path, monkeypatch, caplog):
+    # Run in a new interpreter, as pytest already attaches handlers to the root logger
+    script = (
+        "import logging, types\n"
+        "from utils import nlp_cache\n"
+        "nlp_cache.build_namespace('language', 'not-an-installed-package', types.SimpleNamespace(), ['ENGLISH'])\n"
+        "assert nlp_cache.UNKNOWN_VERSIONS and not logging.getLogger().handlers\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
+
+    monkeypatch.setattr(nlp_cache, "UNKNOWN_VERSIONS", [("language", "lingua-language-detector")])
+    with caplog.at_level(logging.WARNING):
+        open_cache(cache_path, 50)
+    assert "version of lingua-language-detector unknown" in caplog.text
+
+def test_eviction_removes_least_recently_used(cache_path):
+    open_cache(cache_path, 50)
+    for index in range(200):
+        get_or_compute(NAMESPACE, f"old {index}", upper)
+    close_cache()
+    open_cache(cache_path, 50)
+    for index in range(200):
+        get_or_compute(NAMESPACE, f"new {index}", upper)
+    close_cache()
+    open_cache(cache_path, 50)
+    for index in range(50):
+        get_or_compute(NAMESPACE, f"old {index}", fail)
+    size = nlp_cache._database_size(nlp_cache.CACHE["connection"])
+    close_cache()
+
+    max_size_mb = size * 0.6 / 1024 / 1024
+    open_cache(cache_path, max_size_mb)
+    close_cache()
+    assert os.path.getsize(cache_path) <= max_size_mb * 1024 * 1024
+
+    open_cache(cache_path, 50)
+    for index in range(50):
+        assert get_or_compute(NAMESPACE, f"old {index}", fail) == f"OLD {index}"
+    for index in range(50, 200):
+        assert get_or_compute(NAMESPACE, f"old {index}", lambda text: None) is None
+
+def test_workers_share_one_file(cache_path):
+    with multiprocessing.Pool(4) as pool:
+        pool.starmap(write_results, [(cache_path, worker) for worker in range(4)])
+
+    open_cache(cache_path, 50)
+    for index in range(300):
+        assert get_or_compute(NAMESPACE, f"shared {index}", fail) == f"SHARED {index}"
+        for worker in range(4):
+            assert get_or_compute(NAMESPACE, f"worker {worker} {index}", fail) == f"WORKER {worker} {index}"
+
+def test_corrupted_file_is_ignored(cache_path):
+    os.makedirs(os.path.dirname(cache_path))
+    with open(cache_path, "wb") as file:
+        file.write(b"not a database" * 100)
+
+    open_cache(cache_path, 50)
+    assert nlp_cache.CACHE["connection"] is None
+    assert get_or_compute(NAMESPACE, "Vivatech", upper) == "VIVATECH"
@@ -2,11 +2,36 @@ from rdflib import Graph, URIRef, Namespace
 from rdflib.namespace import SKOS, RDF, DCTERMS, OWL, XSD
 from rdflib import Literal as LiteralRDF
 from utils.data_utils import get_uri, cleaning_label, check_mispell
+from utils.nlp_cache import build_namespace, get_or_compute
+from typing import Optional
+import lingua
 from lingua import Language, LanguageDetectorBuilder
 
 ENGLISH_LABELS = []
 languages = [Language.ENGLISH, Language.FRENCH]
 detector = LanguageDetectorBuilder.from_languages(*languages).build()
+LANGUAGE_NAMESPACE = build_namespace("language", "lingua-language-detector", lingua, [language.name for language in languages])
+
+def detect_language(label: str) -> Optional[Language]:
+    """
+    Detects the language of a label, reusing the result stored in the NLP cache when available.
+
+    Parameters:
+    -----------
+    label : str
+        The label whose language is detected.
+
+    Returns:
+    --------
+    Language
+        The language detected by the lingua detector, or None if it could not be detected.
+    """
+    def _detect(text: str) -> Optional[str]:
+        language = detector.detect_language_of(text)
+        return language.name if language is not None else None
+
+    name = get_or_compute(LANGUAGE_NAMESPACE, label, _detect)
+    return getattr(Language, name) if name is not None else None
 
 def add_concept(taxonomy: Graph, namespace: str, concept:dict, level: int, rules: dict, default_language: str, default_version: str, create_english_labels: str, default_status: str, checkmispell: str, column_names: dict) -> None:
     """  
@@ -62,7 +87,7 @@ def add_concept(taxonomy: Graph, namespace: str, concept:dict, level: int, rules
     #taxonomy.add((URIRef(uri), DCTERMS.isReplacedBy, URIRef(get_uri(namespace, concept, level-1))))
     cleaned_label = cleaning_label(concept[f"{column_names['prefLabel']}{level}"], uri, rules)
     if cleaned_label != "":
-        language = detector.detect_language_of(cleaned_label) 
+        language = detect_language(cleaned_label)
         if(language.iso_code_639_1.name == 'EN'):
             ENGLISH_LABELS.append(cleaned_label)
             if(create_english_labels == True):
@@ -124,7 +149,7 @@ def add_topConcept(taxonomy: Graph, namespace: str, concept:dict, level: int, ru
     #taxonomy.add((URIRef(uri), DCTERMS.isReplacedBy, URIRef(get_uri(namespace, concept, level-1))))
     cleaned_label = cleaning_label(concept[f"{column_names['prefLabel']}{level}"], uri, rules)
     if cleaned_label != "":
-        language = detector.detect_language_of(cleaned_label) 
+        language = detect_language(cleaned_label)
         if(language.iso_code_639_1.name == 'EN'):
             ENGLISH_LABELS.append(cleaned_label)
             if(create_english_labels == True):
@@ -182,7 +207,7 @@ def add_conceptScheme(taxonomy: Graph, namespace: str, concept:dict, level: int,
     #taxonomy.add((URIRef(uri), DCTERMS.isReplacedBy, URIRef(get_uri(namespace, concept, level-1))))
     cleaned_label = cleaning_label(concept[f"{column_names['prefLabel']}{level}"], uri, rules)
     if cleaned_label != "":
-        language = detector.detect_language_of(cleaned_label) 
+        language = detect_language(cleaned_label)
         if(language.iso_code_639_1.name == 'EN'):
             ENGLISH_LABELS.append(cleaned_label)
             if(create_english_labels == True):
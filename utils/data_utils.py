@@ -9,6 +9,7 @@ import phunspell
 from rdflib import Graph
 from rdflib.namespace import SKOS  
 from collections import Counter 
+from utils.nlp_cache import build_namespace, get_or_compute
 
 CHANGED_LABELS = {}
 
@@ -79,12 +80,13 @@ def cleaning_label(label: str, uri: str, rules: list) -> str:
 
 pspell_fr = phunspell.Phunspell('fr_FR')
 pspell_en = phunspell.Phunspell('en_GB')
+MISPELL_NAMESPACE = build_namespace("mispell", "phunspell", phunspell, ["fr_FR", "en_GB"])
 
 def check_mispell(definition: str) -> None:
     """    
     Checks a definition for any misspelled words using French and English dictionaries.    
     
-    This function uses a regular expression to split the definition into words, filtering out punctuation and whitespace. It checks for spelling errors first against a French dictionary, then against an English dictionary.    
+    This function uses a regular expression to split the definition into words, filtering out punctuation and whitespace. It checks for spelling errors first against a French dictionary, then against an English dictionary. The misspelled words found for a definition are kept in the NLP cache and reused in the next runs.    
     
     Parameters:    
     -----------    
@@ -99,17 +101,20 @@ def check_mispell(definition: str) -> None:
     -------------    
     - Logs any misspelled words found in the definition to the console.    
     """ 
-    b = ["," , ";" , "." , '"' , "(" , ")." , ")" , ":" , "?)," , ".)" , ")," , "/" , ");" , ".)." , "\"." , ".)," , "?." , "?" , "\"," , "%" , "#" , "!" , "&" , ".;", ",…." , "…." , "»" , "«" , "…)," , "…)" , "...)." , "@" , ".:" , "…)." , "…" , "'" , "€," , "”," , "'”" , ")-", '?".' , '?",' , '?"']  
-    escaped_separators = list(map(re.escape, b))  
-    
-    # Construct the regex pattern  
-    # The pattern will match any of the separators or whitespace  
-    pattern = r'(' + '|'.join(escaped_separators) + r'|\s+)'
-
-    res = list(filter(None, re.split(pattern, definition)))
-    result = list(set(res) - set(b))
-    mispelled_fr = pspell_fr.lookup_list(result)
-    mispelled_en = pspell_en.lookup_list(mispelled_fr)
+    def _lookup(text: str) -> list:
+        b = ["," , ";" , "." , '"' , "(" , ")." , ")" , ":" , "?)," , ".)" , ")," , "/" , ");" , ".)." , "\"." , ".)," , "?." , "?" , "\"," , "%" , "#" , "!" , "&" , ".;", ",…." , "…." , "»" , "«" , "…)," , "…)" , "...)." , "@" , ".:" , "…)." , "…" , "'" , "€," , "”," , "'”" , ")-", '?".' , '?",' , '?"']  
+        escaped_separators = list(map(re.escape, b))  
+        
+        # Construct the regex pattern  
+        # The pattern will match any of the separators or whitespace  
+        pattern = r'(' + '|'.join(escaped_separators) + r'|\s+)'
+
+        res = list(filter(None, re.split(pattern, text)))
+        result = list(set(res) - set(b))
+        mispelled_fr = pspell_fr.lookup_list(result)
+        return pspell_en.lookup_list(mispelled_fr)
+
+    mispelled_en = get_or_compute(MISPELL_NAMESPACE, definition, _lookup)
     if(len(mispelled_en) > 0):
         logging.info(f" mispelled: {mispelled_en} in {definition}")
 
@@ -0,0 +1,346 @@
+import os
+import json
+import time
+import math
+import hashlib
+import logging
+import sqlite3
+from importlib.metadata import version, PackageNotFoundError
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+# State of the cache shared by the whole run, filled by open_cache()
+CACHE = {
+    "connection": None,
+    "path": None,
+    "max_size": 0,
+    "pid": None,
+    "pending": {},
+    "touched": set(),
+    "hits": 0,
+    "misses": 0,
+}
+
+# Checks whose library version is unknown, reported by open_cache() once the logging is configured
+UNKNOWN_VERSIONS = []
+
+# Number of new results kept in memory before being written to the cache file
+FLUSH_EVERY = 500
+
+def build_namespace(name: str, package: str, module: ModuleType, settings: list) -> Optional[str]:
+    """
+    Builds the namespace identifying the results of an NLP check in the cache.
+
+    The namespace combines the name of the check, the installed version of the library performing it and its settings (languages of the detector, dictionaries of the spell checker), so that a result computed with another version or configuration is never reused. The version is read from the distribution metadata, then from the __version__ of the module. When neither is available, the check is not cached and is reported by open_cache(), as this function runs when the modules are imported, before the logging is configured.
+
+    Parameters:
+    -----------
+    name : str
+        The name of the NLP check (e.g. "language", "mispell").
+    package : str
+        The name of the distribution providing the check, used to read its version.
+    module : ModuleType
+        The module performing the check, whose __version__ is used when the distribution is not found.
+    settings : list
+        The settings of the check, such as the languages or the dictionaries used.
+
+    Returns:
+    --------
+    str
+        The namespace of the check, or None if the version of the library is unknown.
+    """
+    try:
+        package_version = version(package)
+    except PackageNotFoundError:
+        package_version = getattr(module, "__version__", None)
+    if package_version is None:
+        UNKNOWN_VERSIONS.append((name, package))
+        return None
+
+    return f"{name}|{package}=={package_version}|{','.join(sorted(settings))}"
+
+def _connect(path: str) -> sqlite3.Connection:
+    """
+    Opens the SQLite file of the cache, creating its table if needed.
+
+    The database is opened in WAL mode with a busy timeout, so that several workers can read it while another one is writing. Incremental auto vacuum is enabled so that the pages freed by the eviction can be released from the file.
+
+    Parameters:
+    -----------
+    path : str
+        The path of the SQLite file.
+
+    Returns:
+    --------
+    sqlite3.Connection
+        The connection to the cache.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    connection = sqlite3.connect(path, timeout=30)
+    # auto_vacuum must be set before the first table is created, older files are converted by a VACUUM
+    connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS nlp_cache (
+            namespace TEXT NOT NULL,
+            text_hash TEXT NOT NULL,
+            value TEXT NOT NULL,
+            last_access REAL NOT NULL,
+            PRIMARY KEY (namespace, text_hash)
+        )
+    """)
+    connection.execute("CREATE INDEX IF NOT EXISTS nlp_cache_last_access ON nlp_cache (last_access)")
+    connection.commit()
+    if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        connection.execute("VACUUM")
+
+    return connection
+
+def _database_size(connection: sqlite3.Connection) -> int:
+    """
+    Returns the size of the pages used by the cache database, free pages excluded.
+
+    Parameters:
+    -----------
+    connection : sqlite3.Connection
+        The connection to the cache.
+
+    Returns:
+    --------
+    int
+        The size of the database, in bytes.
+    """
+    page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+    freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
+    page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+
+    return (page_count - freelist_count) * page_size
+
+def _disable_cache(error: Exception) -> None:
+    """
+    Disables the cache after an error, the checks being computed without it for the rest of the run.
+
+    The cache is only an optimisation: a locked, corrupted or read-only file, or a full disk, must not stop the transformation.
+
+    Parameters:
+    -----------
+    error : Exception
+        The error raised by the cache.
+
+    Returns:
+    --------
+    None
+    """
+    logging.warning(f"NLP cache disabled: {error}")
+    connection = CACHE["connection"]
+    CACHE["connection"] = None
+    CACHE["path"] = None
+    CACHE["pid"] = None
+    CACHE["pending"] = {}
+    CACHE["touched"] = set()
+    if connection is not None:
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+
+def _get_connection() -> Optional[sqlite3.Connection]:
+    """
+    Returns the connection to the cache, reopening it in a forked worker.
+
+    A SQLite connection must not be shared between processes: when the current process is not the one that opened the cache, a new connection is opened on the same file.
+
+    Returns:
+    --------
+    sqlite3.Connection
+        The connection to the cache, or None if the cache is not opened.
+    """
+    if CACHE["connection"] is None:
+        return None
+    if CACHE["pid"] != os.getpid():
+        CACHE["pending"] = {}
+        CACHE["touched"] = set()
+        try:
+            CACHE["connection"] = _connect(CACHE["path"])
+        except (sqlite3.Error, OSError) as error:
+            _disable_cache(error)
+            return None
+        CACHE["pid"] = os.getpid()
+
+    return CACHE["connection"]
+
+def open_cache(path: str, max_size_mb: float) -> None:
+    """
+    Opens the persistent cache of the NLP checks (language detection and spell check).
+
+    Until this function is called, the checks are computed on every call without being cached.
+
+    Parameters:
+    -----------
+    path : str
+        The path of the SQLite file storing the cache. It is created if it does not exist.
+    max_size_mb : float
+        The maximum size of the cache database on disk, in megabytes. The least recently used results are evicted above it when the cache is closed.
+
+    Returns:
+    --------
+    None
+    """
+    close_cache()
+    try:
+        CACHE["connection"] = _connect(path)
+    except (sqlite3.Error, OSError) as error:
+        logging.warning(f"NLP cache disabled: {error}")
+        return
+    CACHE["path"] = path
+    CACHE["max_size"] = int(float(max_size_mb) * 1024 * 1024)
+    CACHE["pid"] = os.getpid()
+    CACHE["hits"] = 0
+    CACHE["misses"] = 0
+    for name, package in UNKNOWN_VERSIONS:
+        logging.warning(f"NLP cache: version of {package} unknown, the {name} results will not be cached")
+
+def flush_cache() -> None:
+    """
+    Writes the new results and the access times kept in memory to the cache file.
+
+    Returns:
+    --------
+    None
+    """
+    connection = _get_connection()
+    if connection is None:
+        return
+
+    now = time.time()
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO nlp_cache (namespace, text_hash, value, last_access) VALUES (?, ?, ?, ?)",
+                [(namespace, text_hash, value, now) for (namespace, text_hash), value in CACHE["pending"].items()]
+            )
+            connection.executemany(
+                "UPDATE nlp_cache SET last_access = ? WHERE namespace = ? AND text_hash = ?",
+                [(now, namespace, text_hash) for namespace, text_hash in CACHE["touched"]]
+            )
+    except sqlite3.Error as error:
+        _disable_cache(error)
+        return
+    CACHE["pending"] = {}
+    CACHE["touched"] = set()
+
+def evict_cache() -> None:
+    """
+    Removes the least recently used results until the cache database fits in its maximum size on disk.
+
+    The share of the rows matching the excess size is deleted and the freed pages are released with an incremental vacuum. As the pages only partly emptied by the deletion are not released, the database is vacuumed when it is still too large, before checking its size again.
+
+    Returns:
+    --------
+    None
+    """
+    connection = _get_connection()
+    if connection is None:
+        return
+
+    try:
+        evicted = 0
+        while True:
+            with connection:
+                # Take the write lock first so that concurrent workers do not evict the same rows
+                connection.execute("BEGIN IMMEDIATE")
+                size = _database_size(connection)
+                count = connection.execute("SELECT COUNT(*) FROM nlp_cache").fetchone()[0]
+                if size <= CACHE["max_size"] or count == 0:
+                    break
+
+                to_evict = math.ceil(count * (size - CACHE["max_size"]) / size)
+                connection.execute("DELETE FROM nlp_cache WHERE rowid IN (SELECT rowid FROM nlp_cache ORDER BY last_access LIMIT ?)", (to_evict,))
+                connection.execute("PRAGMA incremental_vacuum").fetchall()
+                evicted += to_evict
+
+            if _database_size(connection) > CACHE["max_size"]:
+                connection.execute("VACUUM")
+
+        if evicted > 0:
+            # Shrink the WAL file left by the deletions
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            logging.info(f"NLP cache: {evicted} results evicted to stay below {CACHE['max_size']} bytes")
+    except sqlite3.Error as error:
+        _disable_cache(error)
+
+def close_cache() -> None:
+    """
+    Flushes the cache, evicts the results above its maximum size and closes it.
+
+    Returns:
+    --------
+    None
+    """
+    if CACHE["connection"] is None:
+        return
+
+    flush_cache()
+    evict_cache()
+    logging.info(f"NLP cache: {CACHE['hits']} hits, {CACHE['misses']} misses")
+    if CACHE["connection"] is None:
+        return
+
+    try:
+        CACHE["connection"].close()
+    except sqlite3.Error as error:
+        logging.warning(f"NLP cache not closed properly: {error}")
+    CACHE["connection"] = None
+    CACHE["path"] = None
+    CACHE["pid"] = None
+
+def get_or_compute(namespace: str, text: str, compute: Callable[[str], Any]) -> Any:
+    """
+    Returns the cached result of an NLP check on a text, computing and caching it on a miss.
+
+    The results are keyed by the namespace of the check and the SHA-256 hash of the text, and stored as JSON. When the cache is not opened or has been disabled by an error, the check is simply computed.
+
+    Parameters:
+    -----------
+    namespace : str
+        The namespace of the check, as built by build_namespace(). The check is not cached when it is None.
+    text : str
+        The text to check.
+    compute : Callable[[str], Any]
+        The function performing the check on the text. Its result must be JSON serializable.
+
+    Returns:
+    --------
+    Any
+        The result of the check.
+    """
+    connection = _get_connection()
+    if connection is None or namespace is None:
+        return compute(text)
+
+    key = (namespace, hashlib.sha256(text.encode("utf-8")).hexdigest())
+    if key in CACHE["pending"]:
+        CACHE["hits"] += 1
+        return json.loads(CACHE["pending"][key])
+
+    try:
+        row = connection.execute("SELECT value FROM nlp_cache WHERE namespace = ? AND text_hash = ?", key).fetchone()
+    except sqlite3.Error as error:
+        _disable_cache(error)
+        return compute(text)
+    if row is not None:
+        CACHE["hits"] += 1
+        CACHE["touched"].add(key)
+        return json.loads(row[0])
+
+    CACHE["misses"] += 1
+    result = compute(text)
+    CACHE["pending"][key] = json.dumps(result)
+    if len(CACHE["pending"]) >= FLUSH_EVERY:
+        flush_cache()
+
+    return result
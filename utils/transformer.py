@@ -8,6 +8,7 @@ from rdflib import Graph
 from tqdm import tqdm
 from utils.creating_triples import add_concept, add_conceptScheme, add_topConcept, ENGLISH_LABELS
 from utils.data_utils import shacl_validation, CHANGED_LABELS, find_duplicate_values, taxonomy_size_validation
+from utils.nlp_cache import open_cache, close_cache
 
 def adding_triples(taxo_excel: pd, taxo_graph: Graph, level: int, highest_level: str, column_names: dict, D4W_NAMESPACE: str, rules: list, default_language: str, default_version: str, create_english_labels: str, creation_date: str, default_status: str, checkmispell: str, pbar: tqdm) -> None:
     """
@@ -97,6 +98,7 @@ def excel_to_rdf(config: dict) -> None:
     default_version = config['transformation']['default_version']
     default_status = config['transformation']['default_status']
     checkmispell = config['transformation']['check_mispell']
+    cache_config = config.get('cache', {})
     # Defining static variables    
     D4W_NAMESPACE = namespace
     EUROVOC_NS = "http://publications.europa.eu/ontology/euvoc#"
@@ -112,30 +114,38 @@ def excel_to_rdf(config: dict) -> None:
     taxo_graph.bind("status", STATUS_NS)
     taxo_graph.bind("eurovoc", EUROVOC_NS)
 
-    for file_name in os.listdir(input_folder):
-        # Find the french slugs
-        if  file_name.split('.')[0].split("_")[-1].lower() == "fr":
-                slug_df = pd.read_excel(os.path.join(input_folder, file_name))
-
-    for file_name in tqdm(os.listdir(input_folder), total=len(os.listdir(input_folder)), desc="Processing taxonomy", position=0):
-        # Read taxonomy from excel
-        taxo_excel = pd.read_excel(os.path.join(input_folder, file_name))
-        for level in range(int(highest_level), int(lowest_level) + 1):
-            taxo_excel[f"{column_names['Concept']}{level}"] = slug_df[f"{column_names['Concept']}{level}"]
-        taxo_excel = taxo_excel.fillna("")
-        taxo_language = file_name.split('.')[0].split("_")[-1].lower()
-        level_pbars = []  # Keep track of level progress bars
+    # Reuse the language detection and spell check results of the previous runs
+    if cache_config.get('enabled', False):
+        open_cache(cache_config['path'], cache_config['max_size_mb'])
+
+    try:
+        for file_name in os.listdir(input_folder):
+            # Find the french slugs
+            if  file_name.split('.')[0].split("_")[-1].lower() == "fr":
+                    slug_df = pd.read_excel(os.path.join(input_folder, file_name))
+
+        for file_name in tqdm(os.listdir(input_folder), total=len(os.listdir(input_folder)), desc="Processing taxonomy", position=0):
+            # Read taxonomy from excel
+            taxo_excel = pd.read_excel(os.path.join(input_folder, file_name))
+            for level in range(int(highest_level), int(lowest_level) + 1):
+                taxo_excel[f"{column_names['Concept']}{level}"] = slug_df[f"{column_names['Concept']}{level}"]
+            taxo_excel = taxo_excel.fillna("")
+            taxo_language = file_name.split('.')[0].split("_")[-1].lower()
+            level_pbars = []  # Keep track of level progress bars
         
-        # Add triples to the rdf by level of the taxonomy
-        for level in range(int(highest_level), int(lowest_level) + 1):
-            # Create a progress bar for each level
-            pbar = tqdm(total=len(taxo_excel.drop_duplicates(subset=f"{column_names['Concept']}{level}").index), desc=f"Level {level}", leave=False, colour="green")  
-            level_pbars.append(pbar)
+            # Add triples to the rdf by level of the taxonomy
+            for level in range(int(highest_level), int(lowest_level) + 1):
+                # Create a progress bar for each level
+                pbar = tqdm(total=len(taxo_excel.drop_duplicates(subset=f"{column_names['Concept']}{level}").index), desc=f"Level {level}", leave=False, colour="green")  
+                level_pbars.append(pbar)
             
-            adding_triples(taxo_excel, taxo_graph, level, highest_level, column_names, D4W_NAMESPACE, rules, taxo_language, default_version, create_english_labels, creation_date, default_status, checkmispell, pbar)
+                adding_triples(taxo_excel, taxo_graph, level, highest_level, column_names, D4W_NAMESPACE, rules, taxo_language, default_version, create_english_labels, creation_date, default_status, checkmispell, pbar)
         
-        for pbar in level_pbars:  
-            pbar.close()                 
+            for pbar in level_pbars:  
+                pbar.close()
+    finally:
+        # Save the new results even if the transformation fails
+        close_cache()
     
     for rule in rules:
         for rule_label in rule: 